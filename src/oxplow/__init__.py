@@ -1,12 +1,35 @@
+from .cache import ModelCache
 from .core import Field, Model, Postgres
 from .db import PostgresDatabase
-from .errors import ConfigurationError, DatabaseConnectionError
+from .errors import (
+    CircuitOpenError,
+    ConfigurationError,
+    DatabaseConnectionError,
+    QueryError,
+)
+from .profiling import Explain, Profiler
+from .query.aggregates import Avg, Count, Max, Min, Sum
+from .query.query import Query
+from .resilience import CircuitBreaker, RetryPolicy
 
 __all__ = [
     "PostgresDatabase",
     "ConfigurationError",
     "DatabaseConnectionError",
+    "CircuitOpenError",
+    "QueryError",
     "Model",
     "Field",
     "Postgres",
+    "ModelCache",
+    "Query",
+    "Count",
+    "Sum",
+    "Avg",
+    "Min",
+    "Max",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "Explain",
+    "Profiler",
 ]
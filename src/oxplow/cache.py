@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any
+
+from pydantic import TypeAdapter
+
+from oxplow.errors import ConfigurationError
+
+if TYPE_CHECKING:
+    from oxplow.core.models import Model
+
+
+class ModelCache:
+    """In-process cache of model instances keyed by primary key.
+
+    Registering the cache with a database (``db.register_cache(cache)``) lets
+    writes, and ``NOTIFY`` messages from other processes passed to
+    ``db.handle_notification()``, evict stale entries.
+    """
+
+    def __init__(self, model: type[Model]) -> None:
+        self.model = model
+        self.table = model.__table__
+        self.key_fields = [
+            name for name, field in model.__fields__.items() if field.primary_key
+        ]
+        if not self.key_fields:
+            raise ConfigurationError(
+                engine=str(getattr(model, "__engine_type__", "unknown")),
+                reason=f"Model '{model.__name__}' has no primary key to cache by",
+            )
+        self._adapters: dict[str, TypeAdapter[Any]] = {
+            name: TypeAdapter(model.__fields__[name].python_type)
+            for name in self.key_fields
+        }
+        self._entries: dict[tuple[Any, ...], Model] = {}
+        self._lock = threading.Lock()
+
+    def get(self, **key: Any) -> Model | None:
+        with self._lock:
+            return self._entries.get(self._key(key))
+
+    def set(self, instance: Model) -> None:
+        key = self._key(
+            {name: getattr(instance, name, None) for name in self.key_fields}
+        )
+        with self._lock:
+            self._entries[key] = instance
+
+    def invalidate(self, key: dict[str, Any] | None = None) -> None:
+        """Evict the entry for ``key``, or every entry when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(key), None)
+
+    def coerce_key(self, key: Any) -> dict[str, Any]:
+        """Convert a key decoded from JSON back to the primary key field types.
+
+        Raises ``TypeError``, ``KeyError`` or ``ValueError`` for keys that do
+        not describe a primary key of this model.
+        """
+        if not isinstance(key, dict):
+            raise TypeError(f"Expected a mapping of primary key fields, got {key!r}")
+        return {
+            name: self._adapters[name].validate_python(key[name])  # type: ignore
+            for name in self.key_fields
+        }
+
+    def _key(self, values: dict[str, Any]) -> tuple[Any, ...]:
+        missing = [name for name in self.key_fields if name not in values]
+        if missing:
+            raise KeyError(f"Missing primary key fields: {', '.join(missing)}")
+        return tuple(values[name] for name in self.key_fields)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ModelCache(model={self.model.__name__}, entries={len(self)})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, TypeVar
 import pydantic
 from pydantic import BaseModel
 
+from oxplow.query.query import Query
 from oxplow.query.sql import PostgresEngine
 from oxplow.types import DatabaseType
 
@@ -58,6 +59,7 @@ class Model:
     __fields__: dict[str, Field[Any]]
     __db__: Database
     __engine_type__: str
+    __retry_writes__: bool = False
     _pydantic_model: type[BaseModel]
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
@@ -121,6 +123,13 @@ class Model:
             name: getattr(self, name) for name in self.__fields__ if hasattr(self, name)
         }
 
+    @classmethod
+    def _primary_key(cls, data: dict[str, Any]) -> dict[str, Any] | None:
+        names = [name for name, field in cls.__fields__.items() if field.primary_key]
+        if not names or any(name not in data for name in names):
+            return None
+        return {name: data[name] for name in names}
+
     @classmethod
     def create(cls, **kwargs: Any) -> Model:
         cls.validate(cls(**kwargs))
@@ -128,7 +137,12 @@ class Model:
         match cls.__engine_type__:
             case DatabaseType.POSTGRESQL:
                 result = PostgresEngine.insert(
-                    cls.__db__, cls.__table__, kwargs)
+                    cls.__db__, cls.__table__, kwargs, cls.__retry_writes__)
+                key = cls._primary_key(result[0] if result else kwargs)
+                if key is not None:
+                    PostgresEngine.notify_write(
+                        cls.__db__, cls.__table__, "insert", key
+                    )
             case DatabaseType.MONGODB:
                 print(f"Inserting into {cls.__table__}: {kwargs}")
             case _:
@@ -137,6 +151,10 @@ class Model:
                 )
         return cls(**result[0]) if result else cls(**kwargs)
 
+    @classmethod
+    def query(cls, **where: Any) -> Query:
+        return Query(cls, where)
+
     @classmethod
     def get(cls, **kwargs: Any) -> Model:
         return cls(**kwargs)
@@ -1,14 +1,35 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
 from abc import ABC, abstractmethod
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any, cast
+from urllib.parse import urlsplit
 
 import oxpg
 from oxpg import Client as oxpgClient
-from oxpg import InterfaceError
+from oxpg import InterfaceError, OperationalError
 
 from oxplow.registry import registry
 
-from .errors import ConfigurationError
+from .errors import CircuitOpenError, ConfigurationError, DatabaseConnectionError
+from .resilience import CircuitBreaker, RetryPolicy, is_connection_error
 from .types import DatabaseType
 
+if TYPE_CHECKING:
+    from .cache import ModelCache
+    from .profiling import Profiler
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL_PREFIX = "oxplow_"
+
+
+def notify_channel(table: str) -> str:
+    return f"{NOTIFY_CHANNEL_PREFIX}{table}"
+
 
 class Database(ABC):
     name: str
@@ -33,7 +54,6 @@ class Database(ABC):
 
 class PostgresDatabase(Database):
     engine = DatabaseType.POSTGRESQL
-    client: oxpgClient
 
     def __init__(
         self,
@@ -44,8 +64,18 @@ class PostgresDatabase(Database):
         password: str | None = None,
         db: str | None = None,
         name: str = "postgres",
+        notify: bool = False,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
     ) -> None:
         super().__init__(name=name)
+        self.notify = notify
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.profiler: Profiler | None = None
+        self._lock = threading.Lock()
+        self._client: oxpgClient | None = None
+        self._caches: dict[str, list[ModelCache]] = {}
         if not dsn and not (host and user and password or (db or port)):
             raise ConfigurationError(
                 engine="PostgreSQL",
@@ -58,18 +88,22 @@ class PostgresDatabase(Database):
                 reason="Cannot provide both dsn and individual connection parameters",
             )
 
+        self._dsn: str | None = dsn or None
+        self._connect_kwargs: dict[str, Any] = {
+            "host": host,
+            "user": user,
+            "password": password,
+            "port": port if port is not None else 5432,
+            "db": db if db is not None else "postgres",
+        }
+
         try:
-            if dsn:
-                self.client = oxpg.connect(dsn)
-            else:
-                self.client = oxpg.connect(
-                    host=host,
-                    user=user,
-                    password=password,
-                    port=port if port is not None else 5432,
-                    db=db if db is not None else "postgres",
-                )
+            self._client = self._connect()
             registry.register_database(self)
+        except OperationalError as oe:
+            raise DatabaseConnectionError(
+                engine="PostgreSQL", target=self.target, source=oe
+            ) from oe
         except InterfaceError as ie:
             raise ConfigurationError(
                 engine="PostgreSQL",
@@ -83,11 +117,169 @@ class PostgresDatabase(Database):
                 source=e,
             ) from e
 
+    @property
+    def target(self) -> str:
+        """Where this database connects to, without credentials."""
+        if self._dsn is not None:
+            parts = urlsplit(self._dsn)
+            if not parts.hostname:
+                return self.name
+            port = f":{parts.port}" if parts.port else ""
+            return f"{parts.hostname}{port}{parts.path}"
+        kwargs = self._connect_kwargs
+        return f"{kwargs['host']}:{kwargs['port']}/{kwargs['db']}"
+
+    @property
+    def client(self) -> oxpgClient:
+        """The shared client, reconnecting if it was dropped."""
+        return self._acquire()
+
+    def _connect(self) -> oxpgClient:
+        if self._dsn is not None:
+            return oxpg.connect(self._dsn)
+        return oxpg.connect(**self._connect_kwargs)
+
+    def run(
+        self, method: str, sql: str, params: list[object], *, idempotent: bool = True
+    ) -> Any:
+        """Call ``client.<method>(sql, *params)``, reconnecting when needed.
+
+        Failed reconnects are always retried with backoff up to
+        ``retry.attempts`` times since nothing was sent. Once the statement
+        has been sent, a broken connection is retried only for idempotent
+        statements; others may already have applied and raise
+        ``DatabaseConnectionError``. While the circuit breaker is open calls
+        fail immediately with ``CircuitOpenError``; every attempt it lets
+        through is recorded as a success or failure, however it ends.
+        """
+        last_error: Exception | None = None
+        for attempt in range(self.retry.attempts):
+            if attempt:
+                self.retry.sleep(self.retry.delay(attempt - 1))
+            if not self.breaker.allow():
+                raise CircuitOpenError(
+                    engine="PostgreSQL", target=self.target, source=last_error
+                )
+            try:
+                client = self._acquire()
+            except Exception as e:
+                self.breaker.record_failure()
+                if not is_connection_error(e):
+                    raise
+                last_error = e
+                continue
+            except BaseException:
+                self.breaker.record_failure()
+                raise
+            try:
+                result = getattr(client, method)(sql, *params)
+            except Exception as e:
+                if not is_connection_error(e):
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                self._discard(client)
+                last_error = e
+                if not idempotent:
+                    break
+                continue
+            except BaseException:
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+            if self.profiler is not None and method == "query":
+                self.profiler.observe(sql, params)
+            return result
+        raise DatabaseConnectionError(
+            engine="PostgreSQL", target=self.target, source=last_error
+        ) from last_error
+
+    def _acquire(self) -> oxpgClient:
+        with self._lock:
+            if self._client is None:
+                self._client = self._connect()
+            return self._client
+
+    def _discard(self, client: oxpgClient) -> None:
+        """Stop using the broken ``client``; the next call reconnects."""
+        with self._lock:
+            if self._client is client:
+                self._client = None
+        _close(client)
+
+    def register_cache(self, cache: ModelCache) -> None:
+        """Evict entries from ``cache`` whenever its table is written to."""
+        with self._lock:
+            caches = self._caches.setdefault(cache.table, [])
+            if cache not in caches:
+                caches.append(cache)
+
+    def invalidate(self, table: str, key: dict[str, Any] | None = None) -> None:
+        """Evict ``key`` (or everything when None) from local caches of ``table``."""
+        for cache in self._registered(table):
+            cache.invalidate(key)
+
+    def handle_notification(self, channel: str, payload: str) -> None:
+        """Evict local cache entries named by a ``NOTIFY`` from another process.
+
+        oxpg cannot receive notifications, so applications that share caches
+        across processes ``LISTEN`` on ``notify_channel(table)`` with a driver
+        that can, and pass each notification here.
+        """
+        if not channel.startswith(NOTIFY_CHANNEL_PREFIX):
+            return
+        try:
+            loaded = json.loads(payload)
+        except ValueError:
+            loaded = None
+        if not isinstance(loaded, dict):
+            logger.warning("Ignoring malformed notification on %s", channel)
+            return
+        message = cast(dict[str, Any], loaded)
+        table = message.get("table")
+        if not isinstance(table, str) or notify_channel(table) != channel:
+            logger.warning("Ignoring notification for %r on %s", table, channel)
+            return
+        key = message.get("key")
+        for cache in self._registered(table):
+            if key is None:
+                cache.invalidate()
+                continue
+            try:
+                cache.invalidate(cache.coerce_key(key))
+            except Exception:
+                logger.warning(
+                    "Invalid key %r in notification on %s, clearing cache",
+                    key,
+                    channel,
+                    exc_info=True,
+                )
+                cache.invalidate()
+
+    def _registered(self, table: str) -> list[ModelCache]:
+        with self._lock:
+            return list(self._caches.get(table, []))
+
     def disconnect(self) -> None:
-        pass
+        """Close the current connection.
+
+        The database stays usable: the next statement opens a new connection.
+        """
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None:
+            _close(client)
 
     def __repr__(self) -> str:
         return f"PostgresDatabase(name={self.name})"
 
     def __str__(self) -> str:
         return f"PostgresDatabase(name={self.name})"
+
+
+def _close(client: oxpgClient) -> None:
+    """Close ``client`` if it supports it; otherwise dropping it is enough."""
+    close = getattr(client, "close", None)
+    if callable(close):
+        with suppress(Exception):
+            close()
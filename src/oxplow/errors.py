@@ -62,3 +62,26 @@ class DatabaseConnectionError(OxplowError):
         self.engine: str
         self.target: str
         super().__init__(source=source, engine=engine, target=target)
+
+
+class QueryError(OxplowError):
+    """Invalid query built against a model."""
+
+    _template = "Invalid query on {model}: {reason}"
+
+    def __init__(
+        self,
+        *,
+        model: str,
+        reason: str,
+        source: Exception | None = None,
+    ) -> None:
+        self.model: str
+        self.reason: str
+        super().__init__(source=source, model=model, reason=reason)
+
+
+class CircuitOpenError(DatabaseConnectionError):
+    """Refused to contact a database whose circuit breaker is open."""
+
+    _template = "Circuit breaker open for {engine} at {target}"
@@ -0,0 +1,413 @@
+from __future__ import annotations
+
+import json
+import queue
+import random
+import re
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from oxplow.query.sql import PostgresEngine
+from oxplow.registry import registry
+
+if TYPE_CHECKING:
+    from oxplow.core.models import Model
+    from oxplow.db import Database, PostgresDatabase
+
+DEFAULT_LARGE_TABLE_ROWS = 10_000
+DEFAULT_SAMPLE_RATE = 0.01
+
+# Set while oxplow runs its own statements (plans and table sizes) so that
+# profilers neither count nor sample them.
+_internal: ContextVar[bool] = ContextVar("oxplow_internal", default=False)
+
+# A column on the left of a comparison in a plan's "Filter", e.g.
+# "((user_id = $1) AND ((title)::text ~~ 'a%'::text))".
+_FILTER_COLUMN = re.compile(
+    r"([A-Za-z_]\w*)\)?(?:::[\w ]+?)?\s*(?:=|<>|!=|<=|>=|<|>|!?~~\*?|IS\s)"
+)
+
+
+def statement_shape(sql: str) -> str:
+    """Normalise ``sql`` so that executions of one statement group together.
+
+    SQL compiled by ``SQLStatement`` already binds values as ``$n``
+    placeholders, so only whitespace needs collapsing.
+    """
+    return " ".join(sql.split())
+
+
+def filter_columns(condition: str) -> list[str]:
+    return list(dict.fromkeys(_FILTER_COLUMN.findall(condition)))
+
+
+class SeqScan:
+    """A sequential scan found in a query plan.
+
+    ``rows`` is the size of the scanned table, or None when it is unknown.
+    """
+
+    def __init__(self, table: str, rows: int | None, columns: list[str]) -> None:
+        self.table = table
+        self.rows = rows
+        self.columns = columns
+
+    def __repr__(self) -> str:
+        return (
+            f"SeqScan(table={self.table!r}, rows={self.rows}, columns={self.columns!r})"
+        )
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class Explain:
+    """Parsed ``EXPLAIN (FORMAT JSON)`` output for a single statement.
+
+    ``table_rows`` maps tables to their ``pg_class.reltuples`` estimates and
+    is filled in by ``explain()``.
+    """
+
+    def __init__(
+        self,
+        sql: str,
+        output: dict[str, Any],
+        models: Iterable[type[Model]] = (),
+        large_table_rows: int = DEFAULT_LARGE_TABLE_ROWS,
+        table_rows: dict[str, int] | None = None,
+    ) -> None:
+        self.sql = sql
+        self.plan: dict[str, Any] = output["Plan"]
+        self.planning_time: float | None = output.get("Planning Time")
+        self.execution_time: float | None = output.get("Execution Time")
+        self.models = list(models)
+        self.large_table_rows = large_table_rows
+        self.table_rows: dict[str, int] = dict(table_rows or {})
+
+    @classmethod
+    def from_rows(
+        cls,
+        sql: str,
+        rows: list[dict[str, object]],
+        models: Iterable[type[Model]] = (),
+        large_table_rows: int = DEFAULT_LARGE_TABLE_ROWS,
+    ) -> Explain:
+        value = rows[0]["QUERY PLAN"]
+        if isinstance(value, str):
+            value = json.loads(value)
+        return cls(sql, value[0], models, large_table_rows)  # type: ignore
+
+    @property
+    def total_cost(self) -> float:
+        return float(self.plan["Total Cost"])
+
+    @property
+    def shared_hit_blocks(self) -> int | None:
+        """Blocks found in shared buffers, when run with ``BUFFERS``."""
+        return self.plan.get("Shared Hit Blocks")
+
+    @property
+    def shared_read_blocks(self) -> int | None:
+        """Blocks read from disk or the OS cache, when run with ``BUFFERS``."""
+        return self.plan.get("Shared Read Blocks")
+
+    def nodes(self) -> Iterator[dict[str, Any]]:
+        stack = [self.plan]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.get("Plans", [])))
+
+    @property
+    def seq_scans(self) -> list[SeqScan]:
+        scans: list[SeqScan] = []
+        for node in self.nodes():
+            if node.get("Node Type") != "Seq Scan":
+                continue
+            table = node["Relation Name"]
+            # "Plan Rows" is the estimate after filtering, not table size, and
+            # analyzed counts stop where the scan did, e.g. under a Limit or in
+            # an EXISTS subplan, so they only bound the statistics from below.
+            sizes: list[int] = []
+            if table in self.table_rows:
+                sizes.append(self.table_rows[table])
+            if "Actual Rows" in node:
+                # Actual counts are per-loop averages; parallel workers split
+                # the table between loops.
+                rows = node["Actual Rows"] + node.get("Rows Removed by Filter", 0)
+                if node.get("Parallel Aware"):
+                    rows *= node.get("Actual Loops", 1)
+                sizes.append(int(rows))
+            scans.append(
+                SeqScan(
+                    table,
+                    max(sizes) if sizes else None,
+                    filter_columns(node.get("Filter", "")),
+                )
+            )
+        return scans
+
+    @property
+    def scanned_tables(self) -> list[str]:
+        """Tables read by a sequential scan, in plan order."""
+        return list(
+            dict.fromkeys(
+                node["Relation Name"]
+                for node in self.nodes()
+                if node.get("Node Type") == "Seq Scan"
+            )
+        )
+
+    @property
+    def large_seq_scans(self) -> list[SeqScan]:
+        """Sequential scans of large tables, or of tables of unknown size."""
+        return [
+            scan
+            for scan in self.seq_scans
+            if scan.rows is None or scan.rows >= self.large_table_rows
+        ]
+
+    @property
+    def suggestions(self) -> list[str]:
+        return suggest_indexes(self.large_seq_scans, self.models)
+
+    def __repr__(self) -> str:
+        return (
+            f"Explain(sql={self.sql!r}, total_cost={self.total_cost}, "
+            f"execution_time={self.execution_time})"
+        )
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+def explain(
+    db: Database,
+    sql: str,
+    params: list[object],
+    *,
+    analyze: bool = True,
+    models: Iterable[type[Model]] = (),
+    large_table_rows: int = DEFAULT_LARGE_TABLE_ROWS,
+) -> Explain:
+    """``EXPLAIN`` ``sql`` on ``db``, sizing scanned tables from statistics.
+
+    Neither plan estimates nor analyzed row counts give the size of a
+    sequentially scanned table, so it is read from ``pg_class.reltuples``.
+    """
+    token = _internal.set(True)
+    try:
+        rows = PostgresEngine.explain(db, sql, params, analyze)
+        result = Explain.from_rows(sql, rows, models, large_table_rows)
+        if result.scanned_tables:
+            result.table_rows = PostgresEngine.table_rows(db, result.scanned_tables)
+    finally:
+        _internal.reset(token)
+    return result
+
+
+def suggest_indexes(
+    scans: Iterable[SeqScan], models: Iterable[type[Model]] = ()
+) -> list[str]:
+    """Suggest ``CREATE INDEX`` statements for the filter columns of ``scans``.
+
+    When a model maps the scanned table, only its declared fields are
+    considered and primary key or unique fields are skipped, as Postgres
+    already indexes them.
+    """
+    by_table = {model.__table__: model for model in models}
+    suggestions: list[str] = []
+    for scan in scans:
+        columns = scan.columns
+        model = by_table.get(scan.table)
+        if model is not None:
+            fields = model.__fields__
+            columns = [
+                name
+                for name in columns
+                if name in fields
+                and not (fields[name].primary_key or fields[name].unique)
+            ]
+        if not columns:
+            continue
+        statement = f"CREATE INDEX ON {scan.table} ({', '.join(columns)})"
+        if statement not in suggestions:
+            suggestions.append(statement)
+    return suggestions
+
+
+class StatementProfile:
+    """Aggregated samples for one statement shape."""
+
+    def __init__(self, sql: str) -> None:
+        self.sql = sql
+        self.calls = 0
+        self.samples = 0
+        self.errors = 0
+        self.dropped = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.shared_hit_blocks = 0
+        self.shared_read_blocks = 0
+        self.seq_scans: dict[str, int] = {}
+        self.suggestions: list[str] = []
+        self.last_plan: Explain | None = None
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.samples if self.samples else 0.0
+
+    def add(self, explain: Explain) -> None:
+        self.samples += 1
+        self.last_plan = explain
+        elapsed = explain.execution_time or 0.0
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        self.shared_hit_blocks += explain.shared_hit_blocks or 0
+        self.shared_read_blocks += explain.shared_read_blocks or 0
+        for scan in explain.large_seq_scans:
+            rows = max(self.seq_scans.get(scan.table, 0), scan.rows or 0)
+            self.seq_scans[scan.table] = rows
+        for statement in explain.suggestions:
+            if statement not in self.suggestions:
+                self.suggestions.append(statement)
+
+    def __repr__(self) -> str:
+        return (
+            f"StatementProfile(sql={self.sql!r}, calls={self.calls}, "
+            f"samples={self.samples}, dropped={self.dropped}, "
+            f"mean_time={self.mean_time:.3f}, "
+            f"shared_hit_blocks={self.shared_hit_blocks}, "
+            f"shared_read_blocks={self.shared_read_blocks}, "
+            f"seq_scans={self.seq_scans!r}, suggestions={self.suggestions!r})"
+        )
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class Profiler:
+    """Sample statements run on ``db`` and ``EXPLAIN`` them.
+
+    A ``sample_rate`` fraction of queries is explained; ``SELECT`` statements
+    are run again under ``EXPLAIN (ANALYZE, BUFFERS)``, anything else is only
+    planned so that writes are never repeated. Sampled statements are queued
+    and explained on a background thread, so callers never wait for a plan,
+    but every analyzed sample still costs the database a second execution.
+    Samples are dropped while ``queue_size`` are pending. Use as a context
+    manager or call ``start()``/``stop()``.
+    """
+
+    def __init__(
+        self,
+        db: PostgresDatabase,
+        *,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        large_table_rows: int = DEFAULT_LARGE_TABLE_ROWS,
+        queue_size: int = 100,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.db = db
+        self.sample_rate = sample_rate
+        self.large_table_rows = large_table_rows
+        self._rng = rng
+        self._profiles: dict[str, StatementProfile] = {}
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[tuple[str, list[object]] | None] = queue.Queue(
+            maxsize=queue_size
+        )
+        self._worker: threading.Thread | None = None
+
+    def start(self) -> Profiler:
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._work,
+                name=f"oxplow-profiler-{self.db.name}",
+                daemon=True,
+            )
+            self._worker.start()
+        self.db.profiler = self
+        return self
+
+    def stop(self) -> None:
+        """Detach from the database and wait for queued samples to finish."""
+        if self.db.profiler is self:
+            self.db.profiler = None
+        worker = self._worker
+        if worker is not None:
+            self._queue.put(None)
+            worker.join()
+            self._worker = None
+
+    def __enter__(self) -> Profiler:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def observe(self, sql: str, params: list[object]) -> None:
+        """Count an executed statement and possibly queue it for sampling."""
+        if _internal.get():
+            return
+        shape = statement_shape(sql)
+        with self._lock:
+            profile = self._profile(shape)
+            profile.calls += 1
+        if self._rng() >= self.sample_rate:
+            return
+        try:
+            self._queue.put_nowait((sql, list(params)))
+        except queue.Full:
+            with self._lock:
+                profile.dropped += 1
+
+    def _work(self) -> None:
+        while (item := self._queue.get()) is not None:
+            self._sample(*item)
+
+    def _sample(self, sql: str, params: list[object]) -> None:
+        shape = statement_shape(sql)
+        with self._lock:
+            profile = self._profile(shape)
+        try:
+            result = explain(
+                self.db,
+                sql,
+                params,
+                analyze=shape.upper().startswith("SELECT"),
+                models=registry.bound_models(self.db.name),
+                large_table_rows=self.large_table_rows,
+            )
+        except Exception:
+            with self._lock:
+                profile.errors += 1
+            return
+        with self._lock:
+            profile.add(result)
+
+    def _profile(self, shape: str) -> StatementProfile:
+        profile = self._profiles.get(shape)
+        if profile is None:
+            profile = self._profiles[shape] = StatementProfile(shape)
+        return profile
+
+    def report(self) -> list[StatementProfile]:
+        """Sampled statements, slowest total execution time first."""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return sorted(profiles, key=lambda p: p.total_time, reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+    def __repr__(self) -> str:
+        return (
+            f"Profiler(db={self.db.name}, sample_rate={self.sample_rate}, "
+            f"statements={len(self._profiles)})"
+        )
+
+    def __str__(self) -> str:
+        return self.__repr__()
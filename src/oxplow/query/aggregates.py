@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+
+class Aggregate:
+    """A SQL aggregate function applied to a single column."""
+
+    function: str = ""
+
+    def __init__(self, field: str, *, distinct: bool = False) -> None:
+        if distinct and field == "*":
+            raise ValueError(f"{type(self).__name__}(distinct=True) requires a field")
+        self.field = field
+        self.distinct = distinct
+
+    @property
+    def default_alias(self) -> str:
+        if self.field == "*":
+            return self.function.lower()
+        return f"{self.field}__{self.function.lower()}"
+
+    def sql(self) -> str:
+        distinct = "DISTINCT " if self.distinct else ""
+        return f"{self.function}({distinct}{self.field})"
+
+    def __repr__(self) -> str:
+        distinct = ", distinct=True" if self.distinct else ""
+        return f"{type(self).__name__}({self.field!r}{distinct})"
+
+    def __str__(self) -> str:
+        return self.sql()
+
+
+class Count(Aggregate):
+    function = "COUNT"
+
+    def __init__(self, field: str = "*", *, distinct: bool = False) -> None:
+        super().__init__(field, distinct=distinct)
+
+
+class Sum(Aggregate):
+    function = "SUM"
+
+
+class Avg(Aggregate):
+    function = "AVG"
+
+
+class Min(Aggregate):
+    function = "MIN"
+
+
+class Max(Aggregate):
+    function = "MAX"
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from oxplow.errors import QueryError
+from oxplow.profiling import DEFAULT_LARGE_TABLE_ROWS, Explain, explain
+from oxplow.query.aggregates import Aggregate, Count
+from oxplow.query.sql import PostgresEngine, SQLStatement
+from oxplow.types import DatabaseType
+
+if TYPE_CHECKING:
+    from oxplow.core.models import Model
+
+
+class Query:
+    """Lazily built query against a model's table.
+
+    Nothing is sent to the database until a terminal method (``count``,
+    ``exists``, ``aggregate``, ``annotate`` or ``explain``) is called, and
+    each of those compiles into a single SQL statement.
+    """
+
+    def __init__(
+        self,
+        model: type[Model],
+        where: dict[str, object] | None = None,
+        group_by: tuple[str, ...] = (),
+    ) -> None:
+        self.model = model
+        self.where: dict[str, object] = dict(where or {})
+        self._check_fields(*self.where)
+        self.group_fields = group_by
+
+    def filter(self, **where: object) -> Query:
+        return Query(self.model, {**self.where, **where}, self.group_fields)
+
+    def group_by(self, *fields: str) -> Query:
+        if not fields:
+            raise QueryError(
+                model=self.model.__name__,
+                reason="group_by() requires at least one field",
+            )
+        self._check_fields(*fields)
+        return Query(self.model, self.where, fields)
+
+    def count(self) -> int:
+        match self.model.__engine_type__:
+            case DatabaseType.POSTGRESQL:
+                return PostgresEngine.count(
+                    self.model.__db__, self.model.__table__, self.where
+                )
+            case _:
+                raise NotImplementedError(
+                    f"Unsupported database type: {self.model.__engine_type__}"
+                )
+
+    def exists(self) -> bool:
+        match self.model.__engine_type__:
+            case DatabaseType.POSTGRESQL:
+                return PostgresEngine.exists(
+                    self.model.__db__, self.model.__table__, self.where
+                )
+            case _:
+                raise NotImplementedError(
+                    f"Unsupported database type: {self.model.__engine_type__}"
+                )
+
+    def aggregate(self, *args: Aggregate, **kwargs: Aggregate) -> dict[str, object]:
+        if self.group_fields:
+            raise QueryError(
+                model=self.model.__name__,
+                reason="aggregate() cannot be used after group_by(); use annotate()",
+            )
+        rows = self._run(self._named(args, kwargs))
+        return rows[0] if rows else {}
+
+    def annotate(
+        self, *args: Aggregate, **kwargs: Aggregate
+    ) -> list[dict[str, object]]:
+        if not self.group_fields:
+            raise QueryError(
+                model=self.model.__name__,
+                reason="annotate() requires group_by() to be called first",
+            )
+        return self._run(self._named(args, kwargs))
+
+    def explain(
+        self,
+        analyze: bool = True,
+        large_table_rows: int = DEFAULT_LARGE_TABLE_ROWS,
+    ) -> Explain:
+        """Plan (and with ``analyze`` run) the rows this query selects.
+
+        Grouped queries are explained as ``group_by(...).annotate(Count())``.
+        """
+        if self.group_fields:
+            (sql, params) = SQLStatement.aggregate(
+                self.model.__table__,
+                {"count": Count()},
+                self.where,
+                list(self.group_fields),
+            )
+        else:
+            (sql, params) = SQLStatement.select(self.model.__table__, self.where)
+        match self.model.__engine_type__:
+            case DatabaseType.POSTGRESQL:
+                return explain(
+                    self.model.__db__,
+                    sql,
+                    params,
+                    analyze=analyze,
+                    models=[self.model],
+                    large_table_rows=large_table_rows,
+                )
+            case _:
+                raise NotImplementedError(
+                    f"Unsupported database type: {self.model.__engine_type__}"
+                )
+
+    def _run(self, aggregates: dict[str, Aggregate]) -> list[dict[str, object]]:
+        match self.model.__engine_type__:
+            case DatabaseType.POSTGRESQL:
+                return PostgresEngine.aggregate(
+                    self.model.__db__,
+                    self.model.__table__,
+                    aggregates,
+                    self.where,
+                    list(self.group_fields),
+                )
+            case _:
+                raise NotImplementedError(
+                    f"Unsupported database type: {self.model.__engine_type__}"
+                )
+
+    def _named(
+        self, args: tuple[Aggregate, ...], kwargs: dict[str, Aggregate]
+    ) -> dict[str, Aggregate]:
+        aggregates: dict[str, Aggregate] = {}
+        for agg in args:
+            aggregates[agg.default_alias] = agg
+        aggregates.update(kwargs)
+        if not aggregates:
+            raise QueryError(
+                model=self.model.__name__,
+                reason="At least one aggregate is required",
+            )
+        for alias, agg in aggregates.items():
+            if not alias.isidentifier():
+                raise QueryError(
+                    model=self.model.__name__,
+                    reason=f"Invalid aggregate alias '{alias}'",
+                )
+            if alias in self.group_fields:
+                raise QueryError(
+                    model=self.model.__name__,
+                    reason=f"Aggregate alias '{alias}' conflicts with a group field",
+                )
+            if not (agg.field == "*" and isinstance(agg, Count)):
+                self._check_fields(agg.field)
+        return aggregates
+
+    def _check_fields(self, *fields: str) -> None:
+        for name in fields:
+            if name not in self.model.__fields__:
+                raise QueryError(
+                    model=self.model.__name__,
+                    reason=f"Unknown field '{name}'",
+                )
+
+    def __repr__(self) -> str:
+        return (
+            f"Query(model={self.model.__name__}, where={self.where!r}, "
+            f"group_by={self.group_fields!r})"
+        )
+
+    def __str__(self) -> str:
+        return self.__repr__()
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import json
+import logging
 from typing import TYPE_CHECKING
 
-from oxplow.db import PostgresDatabase
+from pydantic_core import to_jsonable_python
+
+from oxplow.db import PostgresDatabase, notify_channel
+from oxplow.query.aggregates import Aggregate
 
 if TYPE_CHECKING:
     from oxplow.db import Database
 
+logger = logging.getLogger(__name__)
+
 
 class SQLStatement:
     @staticmethod
@@ -20,7 +27,72 @@ class SQLStatement:
 
     @staticmethod
     def select(table: str,  data: dict[str, object]) -> tuple[str, list[object]]:
-        ...
+        (clause, params) = SQLStatement.where(data)
+        return (f"SELECT * FROM {table}{clause}", params)
+
+    @staticmethod
+    def count(table: str, where: dict[str, object]) -> tuple[str, list[object]]:
+        (clause, params) = SQLStatement.where(where)
+        sql = f"SELECT COUNT(*) AS count FROM {table}{clause}"
+        return (sql, params)
+
+    @staticmethod
+    def exists(table: str, where: dict[str, object]) -> tuple[str, list[object]]:
+        (clause, params) = SQLStatement.where(where)
+        sql = f"SELECT EXISTS (SELECT 1 FROM {table}{clause}) AS exists"
+        return (sql, params)
+
+    @staticmethod
+    def aggregate(
+        table: str,
+        aggregates: dict[str, Aggregate],
+        where: dict[str, object],
+        group_by: list[str] | None = None,
+    ) -> tuple[str, list[object]]:
+        group_by = group_by or []
+        selected = [
+            *group_by,
+            *(f'{agg.sql()} AS "{alias}"' for alias, agg in aggregates.items()),
+        ]
+        (clause, params) = SQLStatement.where(where)
+        sql = f"SELECT {', '.join(selected)} FROM {table}{clause}"
+        if group_by:
+            columns = ", ".join(group_by)
+            sql += f" GROUP BY {columns} ORDER BY {columns}"
+        return (sql, params)
+
+    @staticmethod
+    def notify(channel: str, payload: str) -> tuple[str, list[object]]:
+        return ("SELECT pg_notify($1, $2)", [channel, payload])
+
+    @staticmethod
+    def explain(
+        sql: str, params: list[object], analyze: bool = True
+    ) -> tuple[str, list[object]]:
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        return (f"EXPLAIN ({options}) {sql}", params)
+
+    @staticmethod
+    def table_rows(table: str) -> tuple[str, list[object]]:
+        sql = (
+            "SELECT reltuples::bigint AS estimate FROM pg_class "
+            "WHERE oid = to_regclass($1)"
+        )
+        return (sql, [table])
+
+    @staticmethod
+    def where(where: dict[str, object], start: int = 1) -> tuple[str, list[object]]:
+        conditions: list[str] = []
+        params: list[object] = []
+        for column, value in where.items():
+            if value is None:
+                conditions.append(f"{column} IS NULL")
+            else:
+                params.append(value)
+                conditions.append(f"{column} = ${start + len(params) - 1}")
+        if not conditions:
+            return ("", params)
+        return (" WHERE " + " AND ".join(conditions), params)
 
     @staticmethod
     def update():
@@ -33,19 +105,93 @@ class SQLStatement:
 
 class PostgresEngine:
     @staticmethod
-    def insert(db: Database, table: str, data: dict[str, object]) -> list[dict[str, object]]:
-        if not isinstance(db, PostgresDatabase):
-            raise TypeError("Expected a PostgresDatabase instance")
+    def insert(
+        db: Database, table: str, data: dict[str, object], idempotent: bool = False
+    ) -> list[dict[str, object]]:
         (sql, params) = SQLStatement.insert(table, data)
         print(f"Executing SQL: {sql} with data: {data}")
-        result: list[dict[str, object]] = db.client.query(  # type: ignore
-            sql, *params)
-        return result
+        return PostgresEngine._query(db, sql, params, idempotent=idempotent)
 
     @staticmethod
     def select(db: Database, table: str, where: dict[str, object]):
         pass
 
+    @staticmethod
+    def count(db: Database, table: str, where: dict[str, object]) -> int:
+        (sql, params) = SQLStatement.count(table, where)
+        rows = PostgresEngine._query(db, sql, params)
+        return int(rows[0]["count"])  # type: ignore
+
+    @staticmethod
+    def exists(db: Database, table: str, where: dict[str, object]) -> bool:
+        (sql, params) = SQLStatement.exists(table, where)
+        rows = PostgresEngine._query(db, sql, params)
+        return bool(rows[0]["exists"])
+
+    @staticmethod
+    def aggregate(
+        db: Database,
+        table: str,
+        aggregates: dict[str, Aggregate],
+        where: dict[str, object],
+        group_by: list[str] | None = None,
+    ) -> list[dict[str, object]]:
+        (sql, params) = SQLStatement.aggregate(table, aggregates, where, group_by)
+        return PostgresEngine._query(db, sql, params)
+
+    @staticmethod
+    def explain(
+        db: Database, sql: str, params: list[object], analyze: bool = True
+    ) -> list[dict[str, object]]:
+        idempotent = not analyze or sql.lstrip().upper().startswith("SELECT")
+        (sql, params) = SQLStatement.explain(sql, params, analyze)
+        return PostgresEngine._query(db, sql, params, idempotent=idempotent)
+
+    @staticmethod
+    def table_rows(db: Database, tables: list[str]) -> dict[str, int]:
+        """Planner estimates of row counts; tables never analyzed are left out."""
+        estimates: dict[str, int] = {}
+        for table in tables:
+            (sql, params) = SQLStatement.table_rows(table)
+            rows = PostgresEngine._query(db, sql, params)
+            if rows and int(rows[0]["estimate"]) >= 0:  # type: ignore
+                estimates[table] = int(rows[0]["estimate"])  # type: ignore
+        return estimates
+
+    @staticmethod
+    def notify_write(
+        db: Database, table: str, op: str, key: dict[str, object] | None
+    ) -> None:
+        """Evict local caches of ``table`` and, if enabled, ``NOTIFY`` others.
+
+        The write has already happened, so a failed ``NOTIFY`` is logged rather
+        than raised.
+        """
+        if not isinstance(db, PostgresDatabase):
+            raise TypeError("Expected a PostgresDatabase instance")
+        db.invalidate(table, key)
+        if not db.notify:
+            return
+        try:
+            message = {"table": table, "op": op, "key": to_jsonable_python(key)}
+            (sql, params) = SQLStatement.notify(
+                notify_channel(table), json.dumps(message)
+            )
+            db.run("execute", sql, params)
+        except Exception:
+            logger.exception("Failed to notify %s write on %s", op, table)
+
+    @staticmethod
+    def _query(
+        db: Database, sql: str, params: list[object], idempotent: bool = True
+    ) -> list[dict[str, object]]:
+        if not isinstance(db, PostgresDatabase):
+            raise TypeError("Expected a PostgresDatabase instance")
+        result: list[dict[str, object]] = db.run(
+            "query", sql, params, idempotent=idempotent
+        )
+        return result
+
     @staticmethod
     def update(db: Database, table: str, data: dict[str, object], where: dict[str, object]):
         pass
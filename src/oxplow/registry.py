@@ -33,6 +33,9 @@ class Registry:
             model_cls.__db__ = db
             self._bound.setdefault(db.name, []).append(model_cls)
 
+    def bound_models(self, db_name: str) -> list[type[Model]]:
+        return list(self._bound.get(db_name, []))
+
     def __str__(self) -> str:
         bound_display = {
             db_name: [cls.__name__ for cls in models]
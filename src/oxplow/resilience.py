@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from collections.abc import Callable
+from enum import Enum
+
+from oxpg import DatabaseError, OperationalError
+
+# tokio-postgres error kinds that mean the connection itself is unusable.
+_CONNECTION_ERROR = re.compile(r"kind: (Closed|Io|Connect|Tls)\b")
+
+
+def is_connection_error(error: Exception) -> bool:
+    """Whether ``error`` means the connection is broken rather than the query."""
+    if isinstance(error, OperationalError):
+        return True
+    return isinstance(error, DatabaseError) and bool(
+        _CONNECTION_ERROR.search(str(error))
+    )
+
+
+class RetryPolicy:
+    """How often and how patiently to retry after a broken connection.
+
+    Delays grow exponentially from ``backoff`` up to ``max_backoff`` with up
+    to ``jitter`` (as a fraction) added so that workers do not reconnect in
+    lockstep.
+    """
+
+    def __init__(
+        self,
+        *,
+        attempts: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0,
+        jitter: float = 0.1,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.sleep = sleep
+
+    def delay(self, attempt: int) -> float:
+        base = min(self.max_backoff, self.backoff * 2**attempt)
+        return base * (1 + random.uniform(0, self.jitter))
+
+    def __repr__(self) -> str:
+        return (
+            f"RetryPolicy(attempts={self.attempts}, backoff={self.backoff}, "
+            f"max_backoff={self.max_backoff}, jitter={self.jitter})"
+        )
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __str__(self) -> str:
+        return self.value
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+class CircuitBreaker:
+    """Fail fast once a database has failed ``failure_threshold`` times in a row.
+
+    After ``reset_timeout`` seconds a single trial call is let through; its
+    outcome closes the circuit again or re-opens it for another timeout.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._state = CircuitState.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            match self._state:
+                case CircuitState.CLOSED:
+                    return True
+                case CircuitState.OPEN:
+                    if self._clock() - self._opened_at < self.reset_timeout:
+                        return False
+                    self._state = CircuitState.HALF_OPEN
+                    return True
+                case CircuitState.HALF_OPEN:
+                    return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state is CircuitState.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+
+    def __repr__(self) -> str:
+        return f"CircuitBreaker(state={self.state}, failures={self._failures})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
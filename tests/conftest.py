@@ -4,12 +4,17 @@ import os
 import pathlib
 import re
 import time
+from collections.abc import Iterator
 from typing import Protocol, cast
+from unittest.mock import MagicMock, patch
 
+import oxpg
 import pytest
+from models import Post
 from pytest import FixtureRequest
 
 from oxplow import PostgresDatabase
+from oxplow.types import DatabaseType
 
 SQL_DIR = pathlib.Path(__file__).parent / "sql"
 
@@ -26,6 +31,11 @@ def get_client(db: PostgresDatabase) -> OxpgClientProto:
     return cast(OxpgClientProto, db.client)
 
 
+def connect(dsn: str) -> OxpgClientProto:
+    """Open a raw client for fixtures, bypassing the oxplow registry."""
+    return cast(OxpgClientProto, oxpg.connect(dsn))
+
+
 def _split_statements(sql: str) -> list[str]:
     """Split a SQL string on semicolons into individual statements.
 
@@ -48,8 +58,7 @@ def wait_for_db(dsn: str, timeout_s: float = 30.0) -> None:
 
     while time.time() < deadline:
         try:
-            db = PostgresDatabase(dsn=dsn)
-            get_client(db).execute("SELECT 1")
+            connect(dsn).execute("SELECT 1")
             return
         except Exception as e:
             last_err = e
@@ -70,8 +79,7 @@ def db_dsn(pytestconfig: pytest.Config) -> str:
 
     wait_for_db(TEST_DSN)
 
-    db = PostgresDatabase(dsn=TEST_DSN)
-    client = get_client(db)
+    client = connect(TEST_DSN)
 
     client.execute("DROP SCHEMA public CASCADE")
     client.execute("CREATE SCHEMA public")
@@ -93,8 +101,46 @@ def reset_db_between_tests(request: FixtureRequest) -> None:
 
     dsn: str = request.getfixturevalue("db_dsn")
 
-    db = PostgresDatabase(dsn=dsn)
-    client = get_client(db)
+    client = connect(dsn)
 
     client.execute("TRUNCATE TABLE posts, users RESTART IDENTITY CASCADE")
     run_sql_file(client, SQL_DIR / "002_seed.sql")
+
+
+@pytest.fixture
+def integration_db(db_dsn: str) -> Iterator[PostgresDatabase]:
+    """A real database that is not registered, so tests can bind models to it."""
+    with patch("oxplow.db.registry"):
+        db = PostgresDatabase(dsn=db_dsn)
+    yield db
+    db.disconnect()
+
+
+@pytest.fixture
+def mock_connect() -> Iterator[MagicMock]:
+    """Patch ``oxpg.connect`` and the registry so unit tests can build databases."""
+    with (
+        patch("oxplow.db.oxpg.connect") as connect,
+        patch("oxplow.db.registry"),
+    ):
+        connect.return_value = MagicMock()
+        yield connect
+
+
+@pytest.fixture
+def post_db(request: FixtureRequest) -> PostgresDatabase:
+    """Bind ``Post`` to a database: the real one for integration tests, else mocked."""
+    if "integration" in request.keywords:
+        db: PostgresDatabase = request.getfixturevalue("integration_db")
+    else:
+        request.getfixturevalue("mock_connect")
+        db = PostgresDatabase(dsn="postgresql://localhost/test_db")
+    Post.__db__ = db
+    Post.__engine_type__ = DatabaseType.POSTGRESQL  # type: ignore[assignment]
+    return db
+
+
+@pytest.fixture
+def client(mock_connect: MagicMock, post_db: PostgresDatabase) -> MagicMock:
+    """The mocked client behind ``post_db``."""
+    return mock_connect.return_value
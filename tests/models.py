@@ -0,0 +1,12 @@
+"""Models for the tables created by ``sql/001_schema.sql``."""
+
+from oxplow.core.models import Field, Model
+
+
+class Post(Model):
+    __table__ = "posts"
+
+    id: Field[int] = Field(primary_key=True)
+    user_id: int
+    title: str
+    published: bool
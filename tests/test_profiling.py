@@ -0,0 +1,291 @@
+"""Unit tests for oxplow.profiling and Query.explain."""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+from models import Post
+
+from oxplow.db import PostgresDatabase
+from oxplow.profiling import Explain, Profiler, filter_columns, statement_shape
+
+
+def plan_rows(
+    plan: dict[str, Any], execution_time: float = 1.5
+) -> list[dict[str, object]]:
+    output = [{"Plan": plan, "Planning Time": 0.1, "Execution Time": execution_time}]
+    return [{"QUERY PLAN": json.dumps(output)}]
+
+
+SEQ_SCAN = {
+    "Node Type": "Seq Scan",
+    "Relation Name": "posts",
+    "Total Cost": 1834.0,
+    "Plan Rows": 10,
+    "Actual Rows": 10,
+    "Rows Removed by Filter": 49990,
+    "Filter": "((user_id = $1) AND (published = $2) AND (id > 5))",
+    "Shared Hit Blocks": 400,
+    "Shared Read Blocks": 50,
+}
+
+
+class TestPlanParsing:
+    def test_filter_columns(self) -> None:
+        condition = "((user_id = $1) AND ((title)::text ~~ 'a%'::text))"
+        assert filter_columns(condition) == ["user_id", "title"]
+        assert filter_columns("(body IS NULL)") == ["body"]
+
+    def test_statement_shape_collapses_whitespace(self) -> None:
+        assert statement_shape("SELECT *\n  FROM posts") == "SELECT * FROM posts"
+
+    def test_large_seq_scan_flagged_with_suggestion(self) -> None:
+        explain = Explain.from_rows("SELECT ...", plan_rows(SEQ_SCAN), [Post])
+
+        assert explain.total_cost == 1834.0
+        assert explain.execution_time == 1.5
+        assert explain.shared_hit_blocks == 400
+        assert explain.shared_read_blocks == 50
+        [scan] = explain.large_seq_scans
+        assert scan.table == "posts"
+        assert scan.rows == 50000
+        assert explain.suggestions == ["CREATE INDEX ON posts (user_id, published)"]
+
+    def test_nested_nodes_and_small_tables(self) -> None:
+        plan = {
+            "Node Type": "Aggregate",
+            "Total Cost": 10.0,
+            "Plans": [{**SEQ_SCAN, "Actual Rows": 1, "Rows Removed by Filter": 2}],
+        }
+        explain = Explain.from_rows("SELECT ...", plan_rows(plan), [Post])
+
+        assert len(explain.seq_scans) == 1
+        assert explain.large_seq_scans == []
+        assert explain.suggestions == []
+
+    def test_parallel_scan_counts_all_loops(self) -> None:
+        plan = {
+            **SEQ_SCAN,
+            "Parallel Aware": True,
+            "Actual Loops": 3,
+            "Actual Rows": 0,
+            "Rows Removed by Filter": 4000,
+        }
+        explain = Explain.from_rows("SELECT ...", plan_rows(plan), [Post])
+
+        [scan] = explain.large_seq_scans
+        assert scan.rows == 12000
+
+    def test_unanalyzed_scan_sized_from_table_rows(self) -> None:
+        plan = {
+            "Node Type": "Seq Scan",
+            "Relation Name": "posts",
+            "Total Cost": 20000.0,
+            "Plan Rows": 5,
+            "Filter": "(user_id = $1)",
+        }
+        explain = Explain.from_rows("SELECT ...", plan_rows(plan), [Post])
+
+        assert explain.scanned_tables == ["posts"]
+        assert [scan.rows for scan in explain.large_seq_scans] == [None]
+
+        explain.table_rows = {"posts": 1_000_000}
+        assert explain.large_seq_scans[0].rows == 1_000_000
+        assert explain.suggestions == ["CREATE INDEX ON posts (user_id)"]
+
+        explain.table_rows = {"posts": 50}
+        assert explain.large_seq_scans == []
+
+    def test_stopped_scan_sized_from_table_rows(self) -> None:
+        plan = {
+            "Node Type": "Limit",
+            "Total Cost": 0.5,
+            "Plans": [{**SEQ_SCAN, "Actual Rows": 1, "Rows Removed by Filter": 3}],
+        }
+        explain = Explain.from_rows("SELECT ...", plan_rows(plan), [Post])
+        assert explain.large_seq_scans == []
+
+        explain.table_rows = {"posts": 50000}
+        [scan] = explain.large_seq_scans
+        assert scan.rows == 50000
+
+    def test_key_fields_not_suggested(self) -> None:
+        plan = {**SEQ_SCAN, "Filter": "(id = $1)"}
+        explain = Explain.from_rows("SELECT ...", plan_rows(plan), [Post])
+
+        assert explain.large_seq_scans
+        assert explain.suggestions == []
+
+
+class TestQueryExplain:
+    def test_explain_analyzes_select(self, client: MagicMock) -> None:
+        client.query.side_effect = [plan_rows(SEQ_SCAN), [{"estimate": 50000}]]
+
+        explain = Post.query(user_id=1).explain()
+
+        assert client.query.call_args_list[0] == call(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+            "SELECT * FROM posts WHERE user_id = $1",
+            1,
+        )
+        assert explain.suggestions == ["CREATE INDEX ON posts (user_id, published)"]
+
+    def test_explain_without_analyze_reads_table_size(self, client: MagicMock) -> None:
+        plan = {
+            "Node Type": "Seq Scan",
+            "Relation Name": "posts",
+            "Total Cost": 20000.0,
+            "Plan Rows": 5,
+            "Filter": "(user_id = $1)",
+        }
+        client.query.side_effect = [plan_rows(plan), [{"estimate": 1_000_000}]]
+
+        explain = Post.query(user_id=1).explain(analyze=False)
+
+        assert explain.suggestions == ["CREATE INDEX ON posts (user_id)"]
+        client.query.assert_called_with(
+            "SELECT reltuples::bigint AS estimate FROM pg_class "
+            "WHERE oid = to_regclass($1)",
+            "posts",
+        )
+
+    def test_explain_grouped_query(self, client: MagicMock) -> None:
+        client.query.side_effect = [plan_rows(SEQ_SCAN), []]
+
+        Post.query().group_by("user_id").explain(analyze=False)
+
+        assert client.query.call_args_list[0] == call(
+            'EXPLAIN (FORMAT JSON) SELECT user_id, COUNT(*) AS "count" FROM posts '
+            "GROUP BY user_id ORDER BY user_id"
+        )
+
+
+class TestProfiler:
+    def test_samples_and_aggregates_by_shape(self, client: MagicMock) -> None:
+        db = Post.__db__
+        assert isinstance(db, PostgresDatabase)
+
+        explained_on: list[str] = []
+
+        def query(sql: str, *params: object) -> list[dict[str, object]]:
+            if sql.startswith("EXPLAIN"):
+                explained_on.append(threading.current_thread().name)
+                return plan_rows(SEQ_SCAN, execution_time=2.0)
+            if "pg_class" in sql:
+                return [{"estimate": 50000}]
+            return [{"count": 1}]
+
+        client.query.side_effect = query
+        with patch("oxplow.profiling.registry") as mock_registry:
+            mock_registry.bound_models.return_value = [Post]
+            with Profiler(db, sample_rate=1.0) as profiler:
+                Post.query(user_id=1).count()
+                Post.query(user_id=2).count()
+        assert db.profiler is None
+        assert explained_on == ["oxplow-profiler-postgres"] * 2
+
+        [profile] = profiler.report()
+        assert profile.sql.startswith("SELECT COUNT(*) AS count FROM posts")
+        assert profile.calls == 2
+        assert profile.samples == 2
+        assert profile.mean_time == 2.0
+        assert profile.shared_hit_blocks == 800
+        assert profile.seq_scans == {"posts": 50000}
+        assert profile.suggestions == ["CREATE INDEX ON posts (user_id, published)"]
+
+    def test_writes_are_planned_not_analyzed(self, client: MagicMock) -> None:
+        db = Post.__db__
+        assert isinstance(db, PostgresDatabase)
+
+        def query(sql: str, *params: object) -> list[dict[str, object]]:
+            return plan_rows(SEQ_SCAN) if sql.startswith("EXPLAIN") else []
+
+        client.query.side_effect = query
+        with Profiler(db, sample_rate=1.0):
+            Post.create(id=1, user_id=1, title="a", published=True)
+
+        explained = [c.args[0] for c in client.query.call_args_list]
+        assert explained[1].startswith("EXPLAIN (FORMAT JSON) INSERT INTO posts")
+
+    def test_unsampled_statements_only_counted(self, client: MagicMock) -> None:
+        db = Post.__db__
+        assert isinstance(db, PostgresDatabase)
+        client.query.return_value = [{"exists": True}]
+
+        with Profiler(db, sample_rate=0.5, rng=lambda: 0.9) as profiler:
+            Post.query().exists()
+
+        [profile] = profiler.report()
+        assert profile.calls == 1
+        assert profile.samples == 0
+        client.query.assert_called_once()
+
+    def test_internal_queries_not_profiled(self, client: MagicMock) -> None:
+        db = Post.__db__
+        assert isinstance(db, PostgresDatabase)
+        plan = {
+            "Node Type": "Seq Scan",
+            "Relation Name": "posts",
+            "Total Cost": 20000.0,
+            "Filter": "(user_id = $1)",
+        }
+        client.query.side_effect = [plan_rows(plan), [{"estimate": 1_000_000}]]
+
+        with Profiler(db, sample_rate=1.0) as profiler:
+            Post.query(user_id=1).explain(analyze=False)
+
+        assert client.query.call_count == 2
+        assert profiler.report() == []
+
+    def test_full_queue_drops_samples(self, client: MagicMock) -> None:
+        db = Post.__db__
+        assert isinstance(db, PostgresDatabase)
+        client.query.return_value = [{"count": 1}]
+        profiler = Profiler(db, sample_rate=1.0, queue_size=1)
+        db.profiler = profiler  # attached without a worker, so nothing drains
+
+        Post.query().count()
+        Post.query().count()
+
+        [profile] = profiler.report()
+        assert profile.calls == 2
+        assert profile.dropped == 1
+        db.profiler = None
+
+    def test_explain_failure_does_not_break_query(self, client: MagicMock) -> None:
+        db = Post.__db__
+        assert isinstance(db, PostgresDatabase)
+        client.query.side_effect = [[{"count": 4}], RuntimeError("no plan")]
+
+        with Profiler(db, sample_rate=1.0) as profiler:
+            assert Post.query().count() == 4
+
+        assert profiler.report()[0].errors == 1
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures("post_db")
+class TestExplainIntegration:
+    """Parse real plans for queries on the seeded posts table."""
+
+    def test_explain_analyze(self) -> None:
+        explain = Post.query(user_id=1).explain(large_table_rows=1)
+
+        assert explain.execution_time is not None
+        assert explain.shared_hit_blocks is not None
+        [scan] = explain.seq_scans
+        assert scan.table == "posts"
+        assert scan.rows == 3
+        assert scan.columns == ["user_id"]
+        assert explain.suggestions == ["CREATE INDEX ON posts (user_id)"]
+
+    def test_explain_without_analyze(self) -> None:
+        explain = Post.query(user_id=1).explain(analyze=False)
+
+        assert explain.execution_time is None
+        assert explain.total_cost > 0
+        assert [scan.table for scan in explain.seq_scans] == ["posts"]
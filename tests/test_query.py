@@ -0,0 +1,142 @@
+"""Unit tests for oxplow.query."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+from models import Post
+
+from oxplow import Avg, Count, Max, Min, Sum
+from oxplow.errors import QueryError
+from oxplow.query.sql import SQLStatement
+
+
+class TestSQLStatementAggregates:
+    def test_count_without_filters(self) -> None:
+        assert SQLStatement.count("posts", {}) == (
+            "SELECT COUNT(*) AS count FROM posts",
+            [],
+        )
+
+    def test_count_with_filters(self) -> None:
+        sql, params = SQLStatement.count("posts", {"user_id": 1, "published": True})
+        assert sql == (
+            "SELECT COUNT(*) AS count FROM posts WHERE user_id = $1 AND published = $2"
+        )
+        assert params == [1, True]
+
+    def test_none_filter_compiles_to_is_null(self) -> None:
+        sql, params = SQLStatement.count("posts", {"body": None, "user_id": 2})
+        assert sql.endswith("WHERE body IS NULL AND user_id = $1")
+        assert params == [2]
+
+    def test_exists(self) -> None:
+        sql, params = SQLStatement.exists("posts", {"user_id": 1})
+        assert sql == (
+            "SELECT EXISTS (SELECT 1 FROM posts WHERE user_id = $1) AS exists"
+        )
+        assert params == [1]
+
+    def test_aggregate(self) -> None:
+        sql, params = SQLStatement.aggregate(
+            "posts", {"total": Sum("id"), "top": Max("id")}, {"published": True}
+        )
+        assert sql == (
+            'SELECT SUM(id) AS "total", MAX(id) AS "top" '
+            "FROM posts WHERE published = $1"
+        )
+        assert params == [True]
+
+    def test_aggregate_grouped(self) -> None:
+        sql, _ = SQLStatement.aggregate("posts", {"posts": Count()}, {}, ["user_id"])
+        assert sql == (
+            'SELECT user_id, COUNT(*) AS "posts" FROM posts '
+            "GROUP BY user_id ORDER BY user_id"
+        )
+
+    def test_count_distinct(self) -> None:
+        assert Count("user_id", distinct=True).sql() == "COUNT(DISTINCT user_id)"
+
+    def test_count_distinct_requires_field(self) -> None:
+        with pytest.raises(ValueError, match="requires a field"):
+            Count(distinct=True)
+
+
+class TestQuery:
+    def test_count(self, client: MagicMock) -> None:
+        client.query.return_value = [{"count": 2}]
+
+        assert Post.query(user_id=1).count() == 2
+        client.query.assert_called_once_with(
+            "SELECT COUNT(*) AS count FROM posts WHERE user_id = $1", 1
+        )
+
+    def test_filter_is_chainable_and_immutable(self, client: MagicMock) -> None:
+        client.query.return_value = [{"exists": False}]
+        base = Post.query(user_id=1)
+
+        assert base.filter(published=False).exists() is False
+        assert base.where == {"user_id": 1}
+        client.query.assert_called_once_with(
+            "SELECT EXISTS (SELECT 1 FROM posts WHERE user_id = $1 "
+            "AND published = $2) AS exists",
+            1,
+            False,
+        )
+
+    def test_aggregate_uses_default_aliases(self, client: MagicMock) -> None:
+        client.query.return_value = [{"id__min": 1, "id__avg": 2}]
+
+        result = Post.query().aggregate(Min("id"), Avg("id"))
+
+        assert result == {"id__min": 1, "id__avg": 2}
+        client.query.assert_called_once_with(
+            'SELECT MIN(id) AS "id__min", AVG(id) AS "id__avg" FROM posts'
+        )
+
+    def test_group_by_annotate(self, client: MagicMock) -> None:
+        rows = [{"user_id": 1, "posts": 2}, {"user_id": 2, "posts": 1}]
+        client.query.return_value = rows
+
+        assert Post.query().group_by("user_id").annotate(posts=Count()) == rows
+
+    def test_unknown_field_rejected(self) -> None:
+        with pytest.raises(QueryError, match="Unknown field 'missing'"):
+            Post.query(missing=1)
+        with pytest.raises(QueryError, match="Unknown field"):
+            Post.query().aggregate(Sum("missing"))
+
+    def test_annotate_requires_group_by(self) -> None:
+        with pytest.raises(QueryError, match="requires group_by"):
+            Post.query().annotate(Count())
+
+    def test_aggregate_rejected_after_group_by(self) -> None:
+        with pytest.raises(QueryError, match="use annotate"):
+            Post.query().group_by("user_id").aggregate(Count())
+
+    def test_aggregate_requires_at_least_one(self) -> None:
+        with pytest.raises(QueryError, match="At least one aggregate"):
+            Post.query().aggregate()
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures("post_db")
+class TestQueryIntegration:
+    """Run compiled aggregates against the seeded posts table."""
+
+    def test_count(self) -> None:
+        assert Post.query().count() == 3
+        assert Post.query(user_id=1).count() == 2
+
+    def test_exists(self) -> None:
+        assert Post.query(user_id=1, published=False).exists() is True
+        assert Post.query(user_id=3).exists() is False
+
+    def test_aggregate(self) -> None:
+        result = Post.query(published=True).aggregate(Max("id"), total=Count())
+        assert result == {"id__max": 3, "total": 2}
+
+    def test_group_by_annotate_keeps_alias_case(self) -> None:
+        rows = Post.query().group_by("user_id").annotate(Posts=Count())
+        assert rows == [{"user_id": 1, "Posts": 2}, {"user_id": 2, "Posts": 1}]